@@ -0,0 +1,90 @@
+"""
+Shared helpers for the test scripts
+
+Used by compare_versions.py and test_mask_generation.py so both scripts load
+the bass filter curve, create the mask generator and generate masks the same
+way. Results are cached, so repeated calls in one process do not re-read,
+re-create or re-generate them.
+
+Example usage:
+    from _test_utils import load_bass_filter, compute_mask_cached
+
+    freqs, gains = load_bass_filter()
+    bin_freqs, complex_mask, actual_magnitude = compute_mask_cached(freqs, gains)
+"""
+
+import os
+from functools import lru_cache
+
+import numpy as np
+from mask_eq_designer import Config, EQMaskGenerator
+
+
+BASS_FILTER_FILE = "test_bass_filter.txt"
+
+
+@lru_cache(maxsize=1)
+def get_mask_generator():
+    """
+    Return a shared EQMaskGenerator using the default Config
+
+    Returns:
+        EQMaskGenerator instance (its settings are in .config)
+    """
+    return EQMaskGenerator(Config())
+
+
+def load_bass_filter(filename=BASS_FILTER_FILE):
+    """
+    Load frequency/gain test curve (freq_hz gain_db per line)
+
+    The parsed curve is cached until the file's modification time changes.
+
+    Args:
+        filename: Path to curve text file
+
+    Returns:
+        Tuple of (freqs, gains_db) as read-only float64 arrays
+    """
+    return _load_curve(filename, os.path.getmtime(filename))
+
+
+def compute_mask_cached(freqs, gains_db):
+    """
+    Generate a minimum-phase mask with the shared generator, memoized on input
+
+    Args:
+        freqs: Array of frequencies in Hz
+        gains_db: Array of gains in dB
+
+    Returns:
+        Tuple of (bin_freqs, complex_mask, actual_magnitude) as read-only arrays
+    """
+    return _compute_mask_cached(tuple(np.asarray(freqs).tolist()),
+                                tuple(np.asarray(gains_db).tolist()))
+
+
+@lru_cache(maxsize=4)
+def _compute_mask_cached(freqs, gains_db):
+    result = get_mask_generator().generate_minimum_phase_mask(
+        np.array(freqs), np.array(gains_db)
+    )
+
+    # Cached arrays are shared between callers
+    for array in result:
+        array.flags.writeable = False
+
+    return result
+
+
+@lru_cache(maxsize=4)
+def _load_curve(filename, mtime):
+    data = np.loadtxt(filename, dtype=np.float64, ndmin=2)
+    freqs = data[:, 0]
+    gains = data[:, 1]
+
+    # Cached arrays are shared between callers
+    freqs.flags.writeable = False
+    gains.flags.writeable = False
+
+    return freqs, gains
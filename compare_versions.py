@@ -5,11 +5,11 @@ that can be manually verified against the JavaScript test output.
 """
 
 import numpy as np
-from mask_eq_designer import Config, EQMaskGenerator
+from _test_utils import get_mask_generator, load_bass_filter, compute_mask_cached
 
 # Initialize
-config = Config()
-eq_gen = EQMaskGenerator(config)
+eq_gen = get_mask_generator()
+config = eq_gen.config
 
 print("=" * 60)
 print("Python Version Output (for comparison with JS)")
@@ -26,7 +26,7 @@ print("-" * 60)
 test_freqs_1 = np.array([100, 1000, 8000])
 test_gains_1 = np.array([0, 0, 0])
 
-bin_freqs_1, complex_mask_1, actual_mag_1 = eq_gen.generate_minimum_phase_mask(
+bin_freqs_1, complex_mask_1, actual_mag_1 = compute_mask_cached(
     test_freqs_1, test_gains_1
 )
 
@@ -40,9 +40,7 @@ print()
 print("Test 2: Bass Filter from File")
 print("-" * 60)
 
-data = np.loadtxt("test_bass_filter.txt")
-test_freqs_2 = data[:, 0]
-test_gains_2 = data[:, 1]
+test_freqs_2, test_gains_2 = load_bass_filter()
 
 print(f"Loaded {len(test_freqs_2)} data points from test_bass_filter.txt")
 print("Input data:")
@@ -50,7 +48,7 @@ for f, g in zip(test_freqs_2, test_gains_2):
     print(f"  {f:.1f} Hz: {g:.1f} dB")
 print()
 
-bin_freqs_2, complex_mask_2, actual_mag_2 = eq_gen.generate_minimum_phase_mask(
+bin_freqs_2, complex_mask_2, actual_mag_2 = compute_mask_cached(
     test_freqs_2, test_gains_2
 )
 
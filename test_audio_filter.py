@@ -21,8 +21,24 @@ import numpy as np
 import argparse
 import re
 from scipy import signal
+from scipy import fft as scipy_fft
 import wave
 import struct
+from math import gcd
+
+# Optional: use pyFFTW (with its plan cache) as the scipy.fft backend.
+# Falls back to scipy's built-in pocketfft if pyFFTW is not installed.
+try:
+    import pyfftw
+    import pyfftw.interfaces.scipy_fft
+    pyfftw.interfaces.cache.enable()
+    FFT_BACKEND = pyfftw.interfaces.scipy_fft
+except ImportError:
+    FFT_BACKEND = 'scipy'
+
+# Header parsing patterns, compiled once at import
+_ARRAY_RE = re.compile(r'float\s+eq_mask\[(\d+)\]\s*=\s*\{([^}]+)\}', re.DOTALL)
+_COMMENT_RE = re.compile(r'//[^\n]*')
 
 
 def parse_header_file(filename):
@@ -39,7 +55,7 @@ def parse_header_file(filename):
         content = f.read()
 
     # Find the eq_mask array
-    match = re.search(r'float\s+eq_mask\[(\d+)\]\s*=\s*\{([^}]+)\}', content, re.DOTALL)
+    match = _ARRAY_RE.search(content)
 
     if not match:
         raise ValueError(f"Could not find eq_mask array in {filename}")
@@ -47,21 +63,20 @@ def parse_header_file(filename):
     array_size = int(match.group(1))
     array_content = match.group(2)
 
-    # Extract float values (only those followed by 'f')
-    values = re.findall(r'([-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?)f', array_content)
-    values = [float(v) for v in values]
-
-    if len(values) != array_size:
-        raise ValueError(f"Expected {array_size} values, found {len(values)}")
+    # Drop per-line comments, then the 'f' suffixes and commas, and parse
+    # the remaining whitespace-separated floats in one call
+    array_content = _COMMENT_RE.sub('', array_content)
+    cleaned = array_content.replace('f', ' ').replace(',', ' ')
+    values = np.fromstring(cleaned, dtype=np.float64, sep=' ')
 
-    # Convert interleaved format to complex array
-    num_bins = array_size // 2
-    complex_mask = np.zeros(num_bins, dtype=np.complex128)
+    if values.size != array_size:
+        raise ValueError(f"Expected {array_size} values, found {values.size}")
+    if array_size % 2:
+        raise ValueError(f"Expected interleaved real/imag pairs, found odd array size {array_size}")
 
-    for i in range(num_bins):
-        real_part = values[i * 2]
-        imag_part = values[i * 2 + 1]
-        complex_mask[i] = real_part + 1j * imag_part
+    # Interleaved [real0, imag0, real1, imag1, ...] float64 has the same memory
+    # layout as complex128, so reinterpret it without copying
+    complex_mask = values.view(np.complex128)
 
     return complex_mask
 
@@ -75,10 +90,10 @@ def generate_white_noise(duration_sec, sample_rate):
         sample_rate: Sample rate in Hz
 
     Returns:
-        Numpy array of white noise samples
+        Numpy array (float32) of white noise samples
     """
     num_samples = int(duration_sec * sample_rate)
-    noise = np.random.randn(num_samples)
+    noise = np.random.randn(num_samples).astype(np.float32)
     return noise
 
 
@@ -91,7 +106,7 @@ def load_audio_file(filename, target_sr):
         target_sr: Target sample rate
 
     Returns:
-        Mono audio signal at target sample rate
+        Mono float32 audio signal at target sample rate
     """
     # Read WAV file
     with wave.open(filename, 'rb') as wav_file:
@@ -105,20 +120,25 @@ def load_audio_file(filename, target_sr):
 
         # Convert to numpy array
         if sample_width == 2:  # 16-bit
-            audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+            raw = np.frombuffer(frames, dtype=np.int16)
+            scale = np.float32(1.0 / 32768.0)
         elif sample_width == 4:  # 32-bit
-            audio = np.frombuffer(frames, dtype=np.int32).astype(np.float32) / 2147483648.0
+            raw = np.frombuffer(frames, dtype=np.int32)
+            scale = np.float32(1.0 / 2147483648.0)
         else:
             raise ValueError(f"Unsupported sample width: {sample_width}")
 
-        # Convert to mono if stereo
+        # Convert to float32 in [-1, 1), averaging channels to mono if stereo
         if n_channels > 1:
-            audio = audio.reshape(-1, n_channels).mean(axis=1)
+            audio = raw.reshape(-1, n_channels).mean(axis=1, dtype=np.float32)
+            audio *= scale
+        else:
+            audio = np.multiply(raw, scale, dtype=np.float32)
 
-    # Resample if necessary
+    # Resample if necessary (polyphase, so no FFT over the whole signal)
     if sr != target_sr:
-        num_samples = int(len(audio) * target_sr / sr)
-        audio = signal.resample(audio, num_samples)
+        g = gcd(sr, target_sr)
+        audio = signal.resample_poly(audio, target_sr // g, sr // g)
 
     return audio
 
@@ -127,80 +147,65 @@ def normalize_to_db(audio, target_db):
     """
     Normalize audio to target dB level
 
+    Float input is scaled in place; other input (e.g. int16 PCM) is first
+    converted to a float copy.
+
     Args:
         audio: Input audio signal
         target_db: Target peak level in dB
 
     Returns:
-        Normalized audio signal
+        Normalized audio signal (float)
     """
-    peak = np.max(np.abs(audio))
+    # No copy for float input, so the multiply below can write back into it
+    audio = np.asarray(audio, dtype=np.result_type(audio, np.float32))
+
+    # Peak magnitude without allocating an abs() copy of the signal
+    peak = max(float(audio.max()), -float(audio.min()))
     target_linear = 10 ** (target_db / 20.0)
 
     if peak > 0:
-        audio = audio * (target_linear / peak)
+        np.multiply(audio, target_linear / peak, out=audio)
 
     return audio
 
 
-def apply_frequency_domain_filter(audio, eq_mask, fft_size, overlap_ratio=0.5):
+def apply_frequency_domain_filter(audio, eq_mask, fft_size):
     """
-    Apply EQ mask using overlap-add frequency domain filtering
+    Apply EQ mask as an FIR filter using overlap-add convolution
+
+    The mask is converted once to its fft_size-tap impulse response, which is
+    then applied with scipy.signal.oaconvolve (block size chosen internally).
 
     Args:
         audio: Input audio signal
         eq_mask: Complex FFT mask (num_bins = fft_size/2 + 1)
         fft_size: FFT size
-        overlap_ratio: Overlap ratio (0.5 = 50%)
 
     Returns:
         Filtered audio signal
     """
-    hop_size = int(fft_size * (1 - overlap_ratio))
-    output = np.zeros(len(audio) + fft_size)
-
-    # Create full symmetric FFT mask for real signal
-    # [DC, f1, ..., fN/2] -> [DC, f1, ..., fN/2, conj(fN/2-1), ..., conj(f1)]
-    full_mask = np.concatenate([eq_mask, np.conj(eq_mask[-2:0:-1])])
-
-    # Process in overlapping frames
-    num_frames = int(np.ceil((len(audio) - fft_size) / hop_size)) + 1
-
-    for i in range(num_frames):
-        start = i * hop_size
-        end = start + fft_size
-
-        # Extract frame with zero-padding if needed
-        if end <= len(audio):
-            frame = audio[start:end]
-        else:
-            frame = np.zeros(fft_size)
-            available = len(audio) - start
-            if available > 0:
-                frame[:available] = audio[start:]
-
-        # Apply windowing (Hann window)
-        window = np.hanning(fft_size)
-        frame_windowed = frame * window
-
-        # FFT
-        spectrum = np.fft.fft(frame_windowed)
-
-        # Apply EQ mask
-        filtered_spectrum = spectrum * full_mask
-
-        # IFFT
-        filtered_frame = np.fft.ifft(filtered_spectrum).real
-
-        # Overlap-add
-        output[start:start + fft_size] += filtered_frame
-
-    # Trim to original length
-    output = output[:len(audio)]
-
-    # Compensate for window gain
-    # With 50% overlap and Hann window, the sum equals 1
-    # For other overlaps, we may need to adjust
+    # Note: the previous implementation Hann-windowed 50% overlapping frames
+    # and multiplied each frame spectrum by the mask. That windows the signal
+    # before a linear filter, relies on the window summing to exactly 1
+    # (np.hanning is not COLA at 50% overlap), and lets the filter tail wrap
+    # around inside each fft_size frame. Convolving with the impulse response
+    # has none of these errors.
+
+    num_bins = fft_size // 2 + 1
+    if len(eq_mask) != num_bins:
+        raise ValueError(f"Expected {num_bins} mask bins for FFT size {fft_size}, found {len(eq_mask)}")
+
+    # Minimum-phase impulse response of the mask, in float32 so float32 audio
+    # is filtered without promotion to float64
+    impulse_response = np.fft.irfft(eq_mask, n=fft_size).astype(np.float32)
+
+    # oaconvolve transforms all blocks in one batched FFT call;
+    # set_workers(-1) lets scipy.fft spread those blocks over all CPU cores
+    with scipy_fft.set_backend(FFT_BACKEND), scipy_fft.set_workers(-1):
+        # Causal filtering: keep the first len(audio) samples of the full
+        # convolution so the output stays time-aligned with the input
+        output = signal.oaconvolve(audio, impulse_response)[:len(audio)]
 
     return output
 
@@ -215,24 +220,16 @@ def save_stereo_wav(filename, left_channel, right_channel, sample_rate):
         right_channel: Right channel audio
         sample_rate: Sample rate in Hz
     """
-    # Ensure same length
+    # Interleaved 16-bit output: row-major (max_len, 2) is WAV frame order.
+    # Starts at zero, which pads the shorter channel.
     max_len = max(len(left_channel), len(right_channel))
-    if len(left_channel) < max_len:
-        left_channel = np.pad(left_channel, (0, max_len - len(left_channel)))
-    if len(right_channel) < max_len:
-        right_channel = np.pad(right_channel, (0, max_len - len(right_channel)))
-
-    # Clip to [-1, 1] and convert to 16-bit PCM
-    left_channel = np.clip(left_channel, -1.0, 1.0)
-    right_channel = np.clip(right_channel, -1.0, 1.0)
-
-    left_int16 = (left_channel * 32767).astype(np.int16)
-    right_int16 = (right_channel * 32767).astype(np.int16)
+    stereo = np.zeros((max_len, 2), dtype=np.int16)
 
-    # Interleave channels
-    stereo = np.empty((max_len * 2,), dtype=np.int16)
-    stereo[0::2] = left_int16
-    stereo[1::2] = right_int16
+    # Clip to [-1, 1], then scale and convert to 16-bit PCM in one ufunc call
+    # that writes straight into the output column
+    for col, channel in enumerate((left_channel, right_channel)):
+        clipped = np.clip(channel, -1.0, 1.0)
+        np.multiply(clipped, np.float32(32767), out=stereo[:len(channel), col], casting='unsafe')
 
     # Write WAV file
     with wave.open(filename, 'wb') as wav_file:
@@ -280,7 +277,7 @@ def main():
     original_normalized = normalize_to_db(audio, TARGET_DB)
 
     # Apply filter to normalized signal
-    print(f"\nApplying frequency-domain filter (FFT size: {FFT_SIZE}, 50% overlap)")
+    print(f"\nApplying frequency-domain filter (FFT size: {FFT_SIZE}, overlap-add convolution)")
     filtered = apply_frequency_domain_filter(original_normalized, eq_mask, FFT_SIZE)
 
     # Report levels
@@ -5,11 +5,11 @@ Tests the minimum-phase mask generation with bass filter input
 """
 
 import numpy as np
-from mask_eq_designer import Config, EQMaskGenerator
+from _test_utils import get_mask_generator, load_bass_filter, compute_mask_cached
 
 # Initialize
-config = Config()
-eq_gen = EQMaskGenerator(config)
+eq_gen = get_mask_generator()
+config = eq_gen.config
 
 print("=" * 60)
 print("Testing Mask EQ Designer Algorithm")
@@ -22,9 +22,7 @@ print()
 
 # Load test bass filter data
 print("Loading test_bass_filter.txt...")
-data = np.loadtxt("test_bass_filter.txt")
-test_freqs = data[:, 0]
-test_gains = data[:, 1]
+test_freqs, test_gains = load_bass_filter()
 
 print(f"Input data points: {len(test_freqs)}")
 print("Frequency (Hz) | Gain (dB)")
@@ -35,7 +33,7 @@ print()
 
 # Generate mask
 print("Generating minimum-phase mask...")
-bin_freqs, complex_mask, actual_magnitude = eq_gen.generate_minimum_phase_mask(
+bin_freqs, complex_mask, actual_magnitude = compute_mask_cached(
     test_freqs, test_gains
 )
 